@@ -384,6 +384,24 @@ func test_split_triangle():
 	assert_true(result["right"].size() >= 3, "Triangle split: right polygon")
 
 
+func test_split_degenerate_normal():
+	var square = PackedVector2Array([
+		Vector2(0, 0),
+		Vector2(100, 0),
+		Vector2(100, 100),
+		Vector2(0, 100)
+	])
+	var result = GeometryCore.split_polygon_by_line(
+		square,
+		Vector2(50, 50),
+		Vector2.ZERO
+	)
+
+	assert_eq(result["left"].size(), 0, "Zero normal defines no line: left is empty")
+	assert_eq(result["right"].size(), 0, "Zero normal defines no line: right is empty")
+	assert_eq(result["intersections"].size(), 0, "Zero normal defines no line: no intersections")
+
+
 # ===== Area Conservation Tests =====
 
 func test_area_conservation_vertical_split():
@@ -473,6 +491,38 @@ func test_area_conservation_triangle_split():
 	assert_almost_eq(total_area, original_area, 1.0, "Triangle split: area conservation")
 
 
+func test_area_conservation_concave_split():
+	# A U-shape cut across both prongs crosses four edges, so each side gets
+	# more points than the convex n + 1.
+	var u_shape = PackedVector2Array([
+		Vector2(0, 0),
+		Vector2(100, 0),
+		Vector2(100, 100),
+		Vector2(70, 100),
+		Vector2(70, 30),
+		Vector2(30, 30),
+		Vector2(30, 100),
+		Vector2(0, 100)
+	])
+	var original_area = GeometryCore.polygon_area(u_shape)
+
+	var result = GeometryCore.split_polygon_by_line(
+		u_shape,
+		Vector2(0, 50),
+		Vector2(0, 1)
+	)
+
+	assert_eq(result["intersections"].size(), 4, "U-shape split: four crossings")
+	assert_eq(result["left"].size(), 8, "U-shape split: left keeps 4 vertices + 4 crossings")
+	assert_eq(result["right"].size(), 8, "U-shape split: right keeps 4 vertices + 4 crossings")
+
+	var left_area = GeometryCore.polygon_area(result["left"])
+	var right_area = GeometryCore.polygon_area(result["right"])
+	assert_almost_eq(left_area, 4200.0, 1.0, "U-shape split: base below the line")
+	assert_almost_eq(right_area, 3000.0, 1.0, "U-shape split: both prongs above the line")
+	assert_almost_eq(left_area + right_area, original_area, 1.0, "U-shape split: area conservation")
+
+
 # ===== Helper Functions Tests =====
 
 func test_segments_intersect_crossing():
@@ -3,6 +3,10 @@
 ## This class provides all geometric calculations needed for the space-folding mechanics.
 ## All functions are static and thread-safe.
 ##
+## The hot kernels (area, centroid, side tests, splitting) type their locals
+## statically so the GDScript VM compiles them to typed instructions instead
+## of Variant dispatch. Keep new locals in them typed for the same reason.
+##
 ## @author: Space-Folding Puzzle Team
 ## @version: 1.0
 
@@ -30,10 +34,10 @@ const EPSILON = 0.0001
 ##   var side = GeometryCore.point_side_of_line(Vector2(10, 10), Vector2(0, 0), Vector2(1, 0))
 ##   # Returns 1 if point is to the right of a vertical line at x=0
 static func point_side_of_line(point: Vector2, line_point: Vector2, line_normal: Vector2) -> int:
-	var to_point = point - line_point
-	var distance = to_point.dot(line_normal)
+	var to_point := point - line_point
+	var distance := to_point.dot(line_normal)
 
-	if abs(distance) < EPSILON:
+	if absf(distance) < EPSILON:
 		return 0
 	return 1 if distance > 0 else -1
 
@@ -62,22 +66,22 @@ static func point_side_of_line(point: Vector2, line_point: Vector2, line_normal:
 ##   # Returns Vector2(5, 5) for a diagonal segment crossing a horizontal line
 static func segment_line_intersection(seg_start: Vector2, seg_end: Vector2,
 									  line_point: Vector2, line_normal: Vector2) -> Variant:
-	var seg_dir = seg_end - seg_start
-	var denominator = seg_dir.dot(line_normal)
+	var seg_dir := seg_end - seg_start
+	var denominator := seg_dir.dot(line_normal)
 
 	# Check if segment is parallel to line
-	if abs(denominator) < EPSILON:
+	if absf(denominator) < EPSILON:
 		return null
 
 	# Calculate intersection parameter t (0 to 1 along segment)
-	var t = (line_point - seg_start).dot(line_normal) / denominator
+	var t := (line_point - seg_start).dot(line_normal) / denominator
 
 	# Check if intersection is within segment bounds
 	if t < -EPSILON or t > 1.0 + EPSILON:
 		return null
 
 	# Clamp t to valid range and return intersection point
-	return seg_start + seg_dir * clamp(t, 0.0, 1.0)
+	return seg_start + seg_dir * clampf(t, 0.0, 1.0)
 
 
 ## Calculates the area of a polygon using the shoelace formula.
@@ -99,15 +103,19 @@ static func polygon_area(vertices: PackedVector2Array) -> float:
 	if vertices.size() < 3:
 		return 0.0
 
-	var area = 0.0
-	var n = vertices.size()
+	var area := 0.0
+	var n := vertices.size()
 
-	for i in range(n):
-		var j = (i + 1) % n
-		area += vertices[i].x * vertices[j].y
-		area -= vertices[j].x * vertices[i].y
+	# Each vertex is fetched out of the packed array once; indexing a
+	# PackedVector2Array copies the element, so .x and .y off the same index
+	# would pay for that copy twice. Carrying the previous vertex (the edge
+	# starting at the last one comes first) also drops the (i + 1) % n.
+	var a := vertices[n - 1]
+	for b: Vector2 in vertices:
+		area += a.x * b.y - b.x * a.y
+		a = b
 
-	return abs(area) / 2.0
+	return absf(area) / 2.0
 
 
 ## Calculates the centroid (geometric center) of a polygon.
@@ -135,20 +143,21 @@ static func polygon_centroid(vertices: PackedVector2Array) -> Vector2:
 	if vertices.size() == 2:
 		return (vertices[0] + vertices[1]) / 2.0
 
-	var centroid = Vector2.ZERO
-	var area = 0.0
-	var n = vertices.size()
+	var centroid := Vector2.ZERO
+	var area := 0.0
+	var n := vertices.size()
 
-	for i in range(n):
-		var j = (i + 1) % n
-		var cross = vertices[i].x * vertices[j].y - vertices[j].x * vertices[i].y
+	var a := vertices[n - 1]
+	for b: Vector2 in vertices:
+		var cross := a.x * b.y - b.x * a.y
 		area += cross
-		centroid += (vertices[i] + vertices[j]) * cross
+		centroid += (a + b) * cross
+		a = b
 
 	area *= 0.5
 
 	# Handle degenerate polygon (area close to zero)
-	if abs(area) < EPSILON:
+	if absf(area) < EPSILON:
 		# Return average of vertices
 		centroid = Vector2.ZERO
 		for v in vertices:
@@ -246,13 +255,15 @@ static func segments_intersect(a1: Vector2, a2: Vector2, b1: Vector2, b2: Vector
 ##
 ## @param vertices: Array of vertices defining the polygon (counter-clockwise winding)
 ## @param line_point: A point on the splitting line
-## @param line_normal: The normal vector of the line (should be normalized, points to RIGHT/positive side)
+## @param line_normal: The normal vector of the line (must be normalized, points to RIGHT/positive side;
+##                     sides are decided by EPSILON on the signed distance, so a scaled normal scales it)
 ## @return: Dictionary with keys:
 ##          - "left": PackedVector2Array of vertices on negative side (normal points away)
 ##          - "right": PackedVector2Array of vertices on positive side (normal points toward)
 ##          - "intersections": PackedVector2Array of intersection points
 ##
 ## Edge cases handled:
+##   - A degenerate (zero-length) line_normal defines no line and returns three empty arrays
 ##   - Vertices exactly on the line are added to both sides
 ##   - Line that doesn't intersect polygon returns one full polygon and one empty
 ##   - Line through vertices creates proper splits
@@ -271,45 +282,91 @@ static func segments_intersect(a1: Vector2, a2: Vector2, b1: Vector2, b2: Vector
 static func split_polygon_by_line(vertices: PackedVector2Array,
 								  line_point: Vector2,
 								  line_normal: Vector2) -> Dictionary:
-	var left_verts = PackedVector2Array()
-	var right_verts = PackedVector2Array()
-	var intersections = PackedVector2Array()
-
-	if vertices.size() < 3:
+	if vertices.size() < 3 or line_normal.length_squared() < EPSILON:
 		return {
 			"left": PackedVector2Array(),
 			"right": PackedVector2Array(),
 			"intersections": PackedVector2Array()
 		}
 
-	var n = vertices.size()
+	var n := vertices.size()
+
+	# Classify every vertex once up front. Walking edges, each vertex is both
+	# an edge's "current" and the previous edge's "next", so classifying inside
+	# the loop would test it twice. This is point_side_of_line inlined, with the
+	# line's offset along its normal taken once: (v - p).n == v.n - p.n, so each
+	# vertex costs one dot product and no call.
+	var line_offset := line_point.dot(line_normal)
+	var sides := PackedInt32Array()
+	sides.resize(n)
+	var on_line := 0
+	var negative := 0
+	for i in range(n):
+		var distance := vertices[i].dot(line_normal) - line_offset
+		if absf(distance) < EPSILON:
+			sides[i] = 0
+			on_line += 1
+		elif distance < 0.0:
+			sides[i] = -1
+			negative += 1
+		else:
+			sides[i] = 1
+
+	# i + 1 - n is the next index written as a negative one: it names vertex
+	# i + 1, and wraps to vertex 0 on the last edge, without a modulo per edge.
+	var crossings := 0
+	for i in range(n):
+		if sides[i] * sides[i + 1 - n] < 0:
+			crossings += 1
+
+	# The sides give every output's size before the walk: each side keeps its
+	# own and on-line vertices plus one point per crossing. Size the arrays
+	# once and write by index instead of growing them with append().
+	var left_verts := PackedVector2Array()
+	var right_verts := PackedVector2Array()
+	var intersections := PackedVector2Array()
+	left_verts.resize(negative + on_line + crossings)
+	right_verts.resize(n - negative + crossings)
+	intersections.resize(on_line + crossings)
+	var li := 0
+	var ri := 0
+	var xi := 0
 
 	# Process each edge of the polygon
 	for i in range(n):
-		var current = vertices[i]
-		var next = vertices[(i + 1) % n]
-
-		var current_side = point_side_of_line(current, line_point, line_normal)
-		var next_side = point_side_of_line(next, line_point, line_normal)
+		var current := vertices[i]
+		var current_side := sides[i]
 
 		# Add current vertex to appropriate side(s)
 		# Normal vector points to the RIGHT/positive side
 		if current_side <= 0:  # On line or negative side (LEFT)
-			left_verts.append(current)
+			left_verts[li] = current
+			li += 1
 		if current_side >= 0:  # On line or positive side (RIGHT)
-			right_verts.append(current)
+			right_verts[ri] = current
+			ri += 1
 
 		# If current vertex is exactly on the line, count it as an intersection
 		if current_side == 0:
-			intersections.append(current)
+			intersections[xi] = current
+			xi += 1
 
 		# Check if edge crosses the line (vertices on strictly opposite sides)
-		if current_side * next_side < 0:  # Different sides (not including 0)
-			var intersection = segment_line_intersection(current, next, line_point, line_normal)
+		if current_side * sides[i + 1 - n] < 0:  # Different sides (not including 0)
+			var intersection = segment_line_intersection(current, vertices[i + 1 - n], line_point, line_normal)
 			if intersection != null:
-				intersections.append(intersection)
-				left_verts.append(intersection)
-				right_verts.append(intersection)
+				intersections[xi] = intersection
+				xi += 1
+				left_verts[li] = intersection
+				li += 1
+				right_verts[ri] = intersection
+				ri += 1
+
+	# A crossing whose intersection came back null (near-parallel edge) wrote
+	# nothing, so trim to what was actually written.
+	left_verts.resize(li)
+	right_verts.resize(ri)
+	intersections.resize(xi)
 
 	return {
 		"left": left_verts,
